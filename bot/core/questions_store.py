@@ -1,13 +1,135 @@
 from __future__ import annotations
 
+import copy
 import json
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
 
 # Dossier où sont stockées les questions :
 # BOT-TERMINER/data/questions/*.json
 QUESTIONS_DIR = Path("data/questions")
 
+# Fichiers techniques (ignorés par get_categories car ce ne sont pas des .json) :
+# - LOCK_FILE : verrou partagé entre processus pour sérialiser les écritures
+# - VERSION_FILE : compteur incrémenté à chaque écriture, sert à invalider les caches
+LOCK_FILE = ".questions.lock"
+VERSION_FILE = ".questions.version"
+
+# umask du processus, lu une fois à l'import (os.umask() ne sait que le modifier)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Cache par processus : clé = slug de catégorie (None = toutes) -> (état, questions)
+_cache: Dict[Optional[str], Tuple[Tuple[Any, ...], List[Dict[str, Any]]]] = {}
+
+
+@contextmanager
+def _store_lock() -> Iterator[None]:
+    """
+    Verrou exclusif inter-processus sur le dossier des questions.
+    Tous les workers (gunicorn, Tkinter, bot) qui écrivent passent par ici,
+    donc deux ajouts simultanés ne peuvent plus s'écraser.
+    """
+    QUESTIONS_DIR.mkdir(parents=True, exist_ok=True)
+    with (QUESTIONS_DIR / LOCK_FILE).open("a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            fh.seek(0)
+            # LK_LOCK abandonne (OSError) après ~10 s : on réessaie jusqu'à
+            # obtenir le verrou, comme flock() qui bloque indéfiniment.
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """
+    Écrit dans un fichier temporaire puis le renomme : un lecteur ne voit
+    jamais un JSON à moitié écrit. Les droits du fichier existant sont
+    conservés (mkstemp crée en 0600), sinon on applique l'umask habituel.
+    """
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def get_version() -> int:
+    """
+    Version courante du stockage (0 si jamais écrit).
+    Partagée entre processus via VERSION_FILE.
+    """
+    try:
+        return int((QUESTIONS_DIR / VERSION_FILE).read_text(encoding="utf-8").strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _store_state(slug: Optional[str] = None) -> Optional[Tuple[Any, ...]]:
+    """
+    Empreinte de l'état du stockage : compteur de version + (nom, mtime, taille)
+    des fichiers JSON concernés. Ainsi une modification faite hors de ce module
+    (édition à la main, git pull, nouveau fichier) invalide aussi le cache.
+    Renvoie None si la catégorie demandée n'existe pas.
+    Un seul stat (catégorie) ou un seul glob (toutes) par appel.
+    """
+    if slug:
+        try:
+            st = (QUESTIONS_DIR / f"{slug}.json").stat()
+        except FileNotFoundError:
+            return None
+        stats = [(f"{slug}.json", st.st_mtime_ns, st.st_size)]
+    else:
+        stats = []
+        for f in sorted(QUESTIONS_DIR.glob("*.json")):
+            try:
+                st = f.stat()
+            except FileNotFoundError:
+                continue
+            stats.append((f.name, st.st_mtime_ns, st.st_size))
+    return (get_version(), tuple(stats))
+
+
+def _bump_version() -> None:
+    # Appelé uniquement sous _store_lock()
+    _write_atomic(QUESTIONS_DIR / VERSION_FILE, str(get_version() + 1))
+
 
 def _slugify(name: str) -> str:
     """
@@ -80,13 +202,28 @@ def load_questions(category: Optional[str] = None) -> List[Dict[str, Any]]:
     return all_questions
 
 
-def save_questions_for_category(category: str, questions: List[Dict[str, Any]]) -> None:
+def load_questions_cached(category: Optional[str] = None) -> List[Dict[str, Any]]:
     """
-    Écrase le fichier d'une catégorie avec la liste fournie.
-    On ne stocke PAS la clé 'category' dans le fichier (elle vient du nom du fichier).
+    Comme load_questions, mais garde le résultat en mémoire dans le processus.
+    Le cache est invalidé dès que la version partagée ou un fichier JSON change
+    (voir _store_state). Les catégories inconnues ne sont pas mises en cache.
+
+    Lecture seule : on renvoie une copie superficielle de la liste, les
+    questions (dict) sont partagées avec le cache et ne doivent pas être modifiées.
     """
+    slug = _slugify(category) if category else None
+    state = _store_state(slug)
+    if state is None:
+        return []
+    hit = _cache.get(slug)
+    if hit is None or hit[0] != state:
+        hit = (state, load_questions(slug))
+        _cache[slug] = hit
+    return list(hit[1])
+
+
+def _save_unlocked(category: str, questions: List[Dict[str, Any]]) -> None:
     path = _file_for_category(category)
-    QUESTIONS_DIR.mkdir(parents=True, exist_ok=True)
 
     cleaned: List[Dict[str, Any]] = []
     for q in questions:
@@ -94,8 +231,17 @@ def save_questions_for_category(category: str, questions: List[Dict[str, Any]])
         d.pop("category", None)
         cleaned.append(d)
 
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(cleaned, f, ensure_ascii=False, indent=2)
+    _write_atomic(path, json.dumps(cleaned, ensure_ascii=False, indent=2))
+    _bump_version()
+
+
+def save_questions_for_category(category: str, questions: List[Dict[str, Any]]) -> None:
+    """
+    Écrase le fichier d'une catégorie avec la liste fournie.
+    On ne stocke PAS la clé 'category' dans le fichier (elle vient du nom du fichier).
+    """
+    with _store_lock():
+        _save_unlocked(category, questions)
 
 
 def add_question(
@@ -107,14 +253,17 @@ def add_question(
 ) -> None:
     """
     Ajoute une question dans le fichier de la catégorie.
+    Lecture + écriture se font sous le même verrou : aucun ajout perdu
+    si plusieurs processus ajoutent en même temps.
     """
-    existing = load_questions(category)
-    existing.append(
-        {
-            "q": q,
-            "choices": choices,
-            "a": answer_index,
-            "difficulty": difficulty,
-        }
-    )
-    save_questions_for_category(category, existing)
+    with _store_lock():
+        existing = load_questions(category)
+        existing.append(
+            {
+                "q": q,
+                "choices": choices,
+                "a": answer_index,
+                "difficulty": difficulty,
+            }
+        )
+        _save_unlocked(category, existing)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import os
+import sys
 
 from flask import Flask, abort, redirect, render_template_string, request, url_for
 
-from bot.core.questions_store import add_question, get_categories, load_questions
+from bot.core.questions_store import add_question, get_categories, load_questions_cached
 
 ADMIN_PANEL_TOKEN = os.getenv("ADMIN_PANEL_TOKEN", "change-me")
 
@@ -42,9 +43,9 @@ def index():
     cats = get_categories()
     category = request.args.get("category") or ""
     if category:
-        questions = load_questions(category)
+        questions = load_questions_cached(category)
     else:
-        questions = load_questions()
+        questions = load_questions_cached()
 
     return render_template_string(
         BASE_TEMPLATE
@@ -156,5 +157,44 @@ def add_post():
     return redirect(url_for("index", token=request.args.get("token")))
 
 
+def serve() -> None:
+    """
+    Mode production : serveur WSGI pré-forké (gunicorn).
+    Chaque worker a son propre cache de questions, invalidé via la version
+    partagée du stockage ; les écritures sont sérialisées par verrou fichier.
+
+    Variables d'environnement :
+    - ADMIN_PANEL_BIND (défaut "0.0.0.0:5000")
+    - ADMIN_PANEL_WORKERS (défaut 4)
+    """
+    if ADMIN_PANEL_TOKEN == "change-me":
+        sys.exit("Mode --prod refusé : définis ADMIN_PANEL_TOKEN (valeur par défaut interdite).")
+
+    try:
+        workers = int(os.getenv("ADMIN_PANEL_WORKERS", "4"))
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        sys.exit("ADMIN_PANEL_WORKERS doit être un entier positif.")
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        sys.exit("Le mode --prod nécessite gunicorn (POSIX uniquement) : pip install gunicorn")
+
+    class _AdminApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", os.getenv("ADMIN_PANEL_BIND", "0.0.0.0:5000"))
+            self.cfg.set("workers", workers)
+
+        def load(self):
+            return app
+
+    _AdminApplication().run()
+
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    if "--prod" in sys.argv[1:]:
+        serve()
+    else:
+        app.run(host="0.0.0.0", port=5000, debug=True)
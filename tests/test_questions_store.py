@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from bot.core import questions_store as qs
+
+CHOICES = ["a", "b", "c", "d"]
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(qs, "QUESTIONS_DIR", tmp_path)
+    monkeypatch.setattr(qs, "_cache", {})
+    return tmp_path
+
+
+def _add_many(directory: str, worker: int, count: int) -> None:
+    qs.QUESTIONS_DIR = Path(directory)
+    for i in range(count):
+        qs.add_question("sport", f"q{worker}-{i}", CHOICES, 0)
+
+
+def _add_one(directory: str) -> None:
+    qs.QUESTIONS_DIR = Path(directory)
+    qs.add_question("sport", "depuis un autre processus", CHOICES, 1)
+
+
+def _run(ctx, target, *args_list) -> None:
+    procs = [ctx.Process(target=target, args=args) for args in args_list]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+
+needs_fork = pytest.mark.skipif(sys.platform == "win32", reason="multiprocessing 'fork' requis")
+
+
+@needs_fork
+def test_concurrent_add_question_loses_nothing(store):
+    ctx = multiprocessing.get_context("fork")
+    workers, per_worker = 8, 25
+    _run(ctx, _add_many, *[(str(store), w, per_worker) for w in range(workers)])
+
+    questions = qs.load_questions("sport")
+    assert len(questions) == workers * per_worker
+    assert len({q["q"] for q in questions}) == workers * per_worker
+    assert qs.get_version() == workers * per_worker
+
+
+@needs_fork
+def test_cache_reloads_after_write_from_other_process(store):
+    qs.add_question("sport", "initiale", CHOICES, 0)
+    version = qs.get_version()
+    assert len(qs.load_questions_cached("sport")) == 1
+
+    _run(multiprocessing.get_context("fork"), _add_one, (str(store),))
+
+    assert qs.get_version() == version + 1
+    assert len(qs.load_questions_cached("sport")) == 2
+    assert len(qs.load_questions_cached()) == 2
+
+
+def test_cache_sees_external_file_edit(store):
+    qs.add_question("sport", "initiale", CHOICES, 0)
+    assert len(qs.load_questions_cached("sport")) == 1
+
+    (store / "sport.json").write_text("[]", encoding="utf-8")
+    assert qs.load_questions_cached("sport") == []
+
+    (store / "cinema.json").write_text(
+        json.dumps([{"q": "x", "choices": CHOICES, "a": 0}]), encoding="utf-8"
+    )
+    assert [q["category"] for q in qs.load_questions_cached()] == ["cinema"]
+
+
+def test_cache_keyed_on_known_slugs(store):
+    qs.add_question("cinema", "x", CHOICES, 0)
+
+    assert len(qs.load_questions_cached("Cinema")) == 1
+    assert len(qs.load_questions_cached(" cinema")) == 1
+    assert qs.load_questions_cached("inconnue") == []
+    assert list(qs._cache) == ["cinema"]
+
+
+def test_failed_write_leaves_no_temp_file(store, monkeypatch):
+    qs.add_question("sport", "initiale", CHOICES, 0)
+    before = (store / "sport.json").read_text(encoding="utf-8")
+
+    def boom(src, dst):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(os, "replace", boom)
+    with pytest.raises(OSError):
+        qs.add_question("sport", "perdue", CHOICES, 0)
+
+    assert list(store.glob("*.tmp")) == []
+    assert (store / "sport.json").read_text(encoding="utf-8") == before
+
+
+def test_cache_hit_does_not_reparse(store, monkeypatch):
+    qs.add_question("sport", "x", CHOICES, 0)
+    calls = []
+    real = qs.load_questions
+
+    def counting(category=None):
+        calls.append(category)
+        return real(category)
+
+    monkeypatch.setattr(qs, "load_questions", counting)
+    for _ in range(3):
+        assert len(qs.load_questions_cached("sport")) == 1
+        assert len(qs.load_questions_cached()) == 1
+    assert calls == ["sport", None]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="droits POSIX")
+def test_write_keeps_file_mode(store):
+    path = store / "sport.json"
+    path.write_text("[]", encoding="utf-8")
+    path.chmod(0o644)
+
+    qs.add_question("sport", "x", CHOICES, 0)
+
+    assert path.stat().st_mode & 0o777 == 0o644
+    assert (store / qs.VERSION_FILE).stat().st_mode & 0o777 == 0o666 & ~qs._UMASK